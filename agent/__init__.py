@@ -0,0 +1,2 @@
+# Daily news briefing agent: fetch headlines, summarize with Gemini,
+# deliver to Discord. Run with `python -m agent`.
@@ -0,0 +1,35 @@
+# agent/__main__.py — entry point. In GitHub Actions, the .yml file
+# handles the schedule, so we just run the job once and exit.
+
+import argparse
+import asyncio
+
+from agent import core
+from agent.sources import rss
+
+# The old GNews-based agent was retired; register new source modules here.
+SOURCES = {"rss": rss}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="agent", description="Daily news briefing agent")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="rss",
+                        help="news source to fetch headlines from")
+    args = parser.parse_args()
+
+    # Why: uvloop (libuv-backed event loop) is a drop-in speedup for the
+    # network-heavy fetch phase. It is optional because it does not
+    # build on Windows, where local development still uses the default
+    # asyncio loop.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    asyncio.run(core.run_agent_job(SOURCES[args.source]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+# agent/core.py — everything that is the same regardless of where the
+# headlines come from: configuration, the Gemini model and briefing
+# cache, the Discord webhook helpers, and the job orchestrator. News
+# sources live in agent/sources/ and expose `fetch(client)`.
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import string
+import threading
+import time
+from datetime import timedelta
+import httpx
+import numpy as np
+import orjson
+from dotenv import load_dotenv
+
+# --- PART A: Configuration ---
+print("News Agent starting up...")
+load_dotenv()
+
+try:
+    GOOGLE_API_KEY = os.environ["GOOGLE_API_KEY"]
+    DISCORD_WEBHOOK_URL = os.environ["DISCORD_WEBHOOK_URL"]
+except KeyError as e:
+    print(f"🛑 FATAL ERROR: Missing secret key in .env file: {e}")
+    exit()
+
+
+# Why: the google.generativeai import alone costs ~300 ms, so it is
+# deferred to first use; fetch-only code paths never pay for it.
+@functools.lru_cache(maxsize=None)
+def _genai():
+    import google.generativeai as genai
+    genai.configure(api_key=GOOGLE_API_KEY)
+    return genai
+
+# Why: the editor persona and format instructions never change between
+# runs, so they live in module constants (static prefix) and only the
+# headline lists are sent per-call (dynamic suffix). The static part is
+# registered with Gemini's Context Caching, which discounts the cached
+# input tokens and lowers time-to-first-token on every daily run.
+EDITOR_PERSONA = """
+You are a senior news editor creating a daily briefing.
+Your task is to create a two-part briefing from the headline lists provided by the user.
+IMPORTANT: Ignore any dates found within the headlines themselves.
+"""
+
+# The instructions below are deliberately verbose: together with the
+# persona they form a long, byte-identical prefix, which is what both
+# explicit Context Caching and Gemini's implicit prefix cache need to
+# hit. Every run sends exactly this text first and only the
+# <HEADLINES> block at the end changes.
+FORMAT_INSTRUCTIONS = """
+**Part 1: Top Headlines**
+From the "General News Headlines" list, select the 3-4 most critical stories. For each, provide a concise one-sentence summary.
+
+**Part 2: AI & Tech Insights**
+Review the "AI & Tech Headlines" list.
+- If the list is NOT empty, select the 2-3 most significant developments. For each, provide a one-sentence summary and a brief "**Why it matters:**" insight.
+- If the list IS empty, simply write: "No major AI & Tech updates to report today."
+
+Format the entire output for Discord using Markdown.
+
+## Style guide
+
+Selection:
+- Prefer stories with broad, concrete impact (elections, conflicts, major policy, large-scale disasters, landmark rulings, significant market moves) over incremental updates to long-running stories.
+- Never select two stories that cover the same underlying event; if two headlines overlap, summarize the event once.
+- Do not invent stories. Only summarize what is supported by a headline in the list; if a headline is ambiguous, keep the summary equally conservative.
+- Ignore listicles, horoscopes, live-blog fragments, and promotional headlines.
+
+Summaries:
+- Exactly one sentence per story, under 30 words, in neutral newswire register.
+- Lead with the actor and the action ("X did Y"), not with commentary.
+- No hedging filler ("reportedly", "it seems"), no editorializing adjectives, no exclamation marks.
+- Spell out names and organizations on first mention; avoid unexplained abbreviations.
+
+"Why it matters" insights (Part 2 only):
+- One sentence explaining the practical consequence for the industry, consumers, or policy — not a restatement of the summary.
+- Ground the insight in the development itself; do not speculate beyond a first-order implication.
+
+Discord Markdown rules:
+- Part headers exactly as: `**Part 1: Top Headlines**` and `**Part 2: AI & Tech Insights**`.
+- One bullet (`- `) per story; bold the story's key subject inside the bullet.
+- Insights go on their own line as `**Why it matters:** ...` beneath the story's bullet.
+- No tables, no code blocks, no links, no @mentions, no emoji beyond those shown in the example.
+- Keep the whole briefing under 1800 characters so it fits one Discord message.
+
+## Example
+
+Given headlines about a central-bank rate cut, a coastal typhoon, a chip-export rule, and a new open-weights model, a correct briefing looks like:
+
+**Part 1: Top Headlines**
+- The **European Central Bank** cut its benchmark rate by 25 basis points, its first easing step in over a year.
+- **Typhoon Mora** made landfall near Da Nang, forcing the evacuation of more than 200,000 residents along Vietnam's coast.
+- The **United States** finalized rules restricting exports of advanced AI chips to a further twelve countries.
+
+**Part 2: AI & Tech Insights**
+- **Mistral** released an open-weights 70B model matching closed frontier models on reasoning benchmarks.
+**Why it matters:** Competitive open weights compress the pricing power of proprietary model vendors and widen access for smaller teams.
+- **The chip-export rules** extend licensing requirements to mid-range accelerators, not just flagship parts.
+**Why it matters:** Cloud providers outside the covered regions become the main channel for restricted compute, reshaping where AI workloads run.
+
+Follow this structure exactly. The headlines to use for today's briefing appear between the <HEADLINES> tags at the end of the message; everything above the tags is fixed guidance.
+"""
+
+GEMINI_CACHE_FILE = "gemini_cache.json"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gemini_model():
+    """Build the Gemini model on top of a cached copy of the static prompt.
+
+    The cache handle is persisted to disk so consecutive runs within the
+    24 h TTL reuse the same cached prefix. If the cache cannot be created
+    or fetched (e.g. the prefix is below the model's minimum cacheable
+    size), fall back to a plain model carrying the same instructions.
+    Built lazily on first use so the feed-fetch phase (and dry runs that
+    never reach Gemini) skip the CachedContent round trip.
+    """
+    genai = _genai()
+    try:
+        with open(GEMINI_CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = genai.caching.CachedContent.get(json.load(f)["name"])
+        return genai.GenerativeModel.from_cached_content(cached_content=cached)
+    except Exception:
+        pass
+    try:
+        cached = genai.caching.CachedContent.create(
+            model='models/gemini-1.5-flash',
+            system_instruction=EDITOR_PERSONA,
+            contents=[FORMAT_INSTRUCTIONS],
+            ttl=timedelta(hours=24),
+        )
+        with open(GEMINI_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"name": cached.name}, f)
+        return genai.GenerativeModel.from_cached_content(cached_content=cached)
+    except Exception as e:
+        print(f"⚠️ Gemini context caching unavailable ({e}); using uncached model.")
+        return genai.GenerativeModel(
+            'gemini-1.5-flash',
+            system_instruction=EDITOR_PERSONA + FORMAT_INSTRUCTIONS)
+
+
+# Why: one shared async client keeps TCP+TLS connections alive between
+# calls (saving a handshake per request), retries failed connects, and
+# speaks HTTP/2 where the server supports it. run_agent_job opens it
+# once and hands it to every fetch/send helper.
+def _make_http_client():
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        transport=httpx.AsyncHTTPTransport(retries=3),
+        follow_redirects=True,
+    )
+
+
+# --- PART C: Semantic cache for generated briefings ---
+# Why: a retry or restart shortly after a successful run sees the same
+# (or nearly the same) headlines. Re-asking Gemini then is pure cost, so
+# recent briefings are kept in a small sqlite cache keyed by an exact
+# hash of the headlines, with an embedding-similarity fallback for
+# near-identical headline sets.
+BRIEFING_CACHE_FILE = "briefing_cache.sqlite"
+BRIEFING_CACHE_TTL = 6 * 60 * 60  # seconds
+BRIEFING_CACHE_MAX_ROWS = 200
+BRIEFING_SIMILARITY_THRESHOLD = 0.92
+
+
+def _briefing_cache_db():
+    db = sqlite3.connect(BRIEFING_CACHE_FILE)
+    db.execute("""CREATE TABLE IF NOT EXISTS briefings (
+                      hash TEXT PRIMARY KEY,
+                      headlines_json TEXT,
+                      embedding BLOB,
+                      scale REAL,
+                      briefing TEXT,
+                      ts REAL)""")
+    try:
+        db.execute("ALTER TABLE briefings ADD COLUMN scale REAL")
+    except sqlite3.OperationalError:
+        pass  # column already present
+    return db
+
+
+def _embed_headlines(headlines_text):
+    result = _genai().embed_content(model="models/text-embedding-004",
+                                    content=headlines_text)
+    return np.asarray(result["embedding"], dtype=np.float32)
+
+
+# Why: int8 rows are 4x smaller than FP32 and integer dot products scan
+# faster. Cosine similarity is scale-invariant, so the per-vector scale
+# factor cancels out of the comparison; it is stored anyway so vectors
+# can be dequantized. At the 0.92 threshold the ~0.01 quantization
+# noise is irrelevant.
+def _quantize_embedding(vec):
+    """Quantize an FP32 embedding to (int8 vector, scale factor)."""
+    scale = float(np.max(np.abs(vec))) or 1.0
+    return np.round(vec * (127.0 / scale)).astype(np.int8), scale
+
+
+def _find_exact_briefing(db, headline_hash, now):
+    row = db.execute("SELECT briefing, ts FROM briefings WHERE hash = ?",
+                     (headline_hash,)).fetchone()
+    if row and now - row[1] < BRIEFING_CACHE_TTL:
+        print("♻️ Reusing briefing from cache (exact headline match).")
+        return row[0]
+    return None
+
+
+def _find_similar_briefing(db, embedding, now):
+    query = embedding.astype(np.int32)
+    query_norm = np.linalg.norm(query)
+    for blob, briefing, ts in db.execute(
+            "SELECT embedding, briefing, ts FROM briefings"):
+        if blob is None or now - ts >= BRIEFING_CACHE_TTL:
+            continue
+        other = np.frombuffer(blob, dtype=np.int8).astype(np.int32)
+        if other.shape != query.shape:
+            continue  # row predates int8 quantization
+        cos = float(np.dot(query, other)
+                    / (query_norm * np.linalg.norm(other)))
+        if cos > BRIEFING_SIMILARITY_THRESHOLD:
+            print(f"♻️ Reusing briefing from cache (similarity {cos:.3f}).")
+            return briefing
+    return None
+
+
+def _store_briefing(db, headline_hash, headlines, embedding, scale,
+                    briefing, now):
+    # Name the columns: databases migrated by the guarded ALTER TABLE
+    # have `scale` appended last, so positional order differs.
+    db.execute("""INSERT OR REPLACE INTO briefings
+                      (hash, headlines_json, embedding, scale, briefing, ts)
+                      VALUES (?, ?, ?, ?, ?, ?)""",
+               (headline_hash, json.dumps(headlines),
+                embedding.tobytes() if embedding is not None else None,
+                scale, briefing, now))
+    # Keep only the most recent rows so the scan stays bounded.
+    db.execute("""DELETE FROM briefings WHERE hash NOT IN (
+                      SELECT hash FROM briefings
+                      ORDER BY ts DESC LIMIT ?)""",
+               (BRIEFING_CACHE_MAX_ROWS,))
+    db.commit()
+
+
+# --- PART C (cont.): **UPGRADED** Function for AI Summarization ---
+# Why: only the dynamic headline block is sent per call; the persona and
+# format instructions ride along via the cached/static model prefix.
+# Gemini is streamed straight into Discord, so the first lines of the
+# briefing appear after the model's first tokens instead of after the
+# whole generation finishes.
+# Why: all static guidance lives in the cached prefix above; the
+# per-call prompt is nothing but the dynamic block, fenced in
+# <HEADLINES> tags at the very end so the stable prefix stays
+# byte-identical between runs for implicit prefix caching too.
+PROMPT_TEMPLATE = string.Template("""<HEADLINES>
+**General News Headlines:**
+$general
+
+**AI & Tech Headlines:**
+$ai
+</HEADLINES>
+""")
+
+
+async def create_briefing_from_headlines(client, greeting,
+                                         general_headlines, ai_headlines):
+    print("🧠 Creating analytical briefing with Gemini...")
+    prompt = PROMPT_TEMPLATE.substitute(
+        general="\n".join(f"- {h}" for h in general_headlines),
+        ai="\n".join(f"- {h}" for h in ai_headlines))
+
+    headlines = sorted(general_headlines + ai_headlines)
+    headline_hash = hashlib.sha256("\n".join(headlines).encode()).hexdigest()
+    now = time.time()
+    db = _briefing_cache_db()
+    try:
+        cached = _find_exact_briefing(db, headline_hash, now)
+        embedding = None
+        scale = None
+        if cached is None:
+            # Only pay for an embedding once the cheap exact-hash check
+            # has missed; it feeds the similarity scan and the stored row.
+            try:
+                embedding, scale = _quantize_embedding(
+                    _embed_headlines("\n".join(headlines)))
+            except Exception as e:
+                print(f"  - ⚠️ Could not embed headlines for cache lookup: {e}")
+            if embedding is not None:
+                cached = _find_similar_briefing(db, embedding, now)
+        if cached is not None:
+            await send_discord_message(client, greeting + cached)
+            return
+
+        try:
+            response = _get_gemini_model().generate_content(prompt, stream=True)
+            briefing = await _stream_to_discord(
+                client, greeting, (chunk.text for chunk in response))
+        except Exception as e:
+            print(f"🛑 Error creating briefing with Gemini: {e}")
+            await send_discord_message(
+                client,
+                greeting + "Could not generate the briefing due to an API error.")
+            return
+
+        _store_briefing(db, headline_hash, headlines, embedding, scale,
+                        briefing.strip(), now)
+    finally:
+        db.close()
+
+
+# --- PART D: Functions to Send to Discord ---
+DISCORD_MESSAGE_LIMIT = 2000
+STREAM_EDIT_INTERVAL = 0.5   # seconds between webhook edits
+STREAM_EDIT_CHARS = 500      # or whenever this many new chars arrived
+
+
+# Why: orjson serializes at C speed and the body is built exactly once
+# per request, instead of httpx re-encoding a dict via stdlib json.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _webhook_body(content):
+    return orjson.dumps({"content": content})
+
+
+def _chunk_message(text, limit=DISCORD_MESSAGE_LIMIT):
+    """Split text into <= limit-char chunks in a single pass.
+
+    Prefers breaking at a newline so Markdown lines stay intact;
+    guarantees every chunk fits under Discord's hard message limit
+    rather than risking a 400 that wastes a round trip.
+    """
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 1, limit)
+        if cut == -1:
+            cut = limit
+        chunks.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+async def _post_discord_message(client, content):
+    """POST a new webhook message and return its id for later edits."""
+    response = await client.post(DISCORD_WEBHOOK_URL,
+                                 params={"wait": "true"},
+                                 content=_webhook_body(content),
+                                 headers=_JSON_HEADERS)
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+async def _edit_discord_message(client, message_id, content):
+    response = await client.patch(
+        f"{DISCORD_WEBHOOK_URL}/messages/{message_id}",
+        content=_webhook_body(content),
+        headers=_JSON_HEADERS)
+    response.raise_for_status()
+
+
+async def _stream_to_discord(client, initial_text, fragments):
+    """Write streamed text to Discord as it arrives.
+
+    Posts an initial message containing `initial_text`, then appends each
+    fragment by editing the message, throttled to one edit per ~500 ms or
+    500 new chars. When a fragment would push past Discord's 2000-char
+    limit the current message is finalized and a fresh one is started.
+    Returns the concatenation of all fragments (without `initial_text`).
+    """
+    full = []
+    buffer = initial_text
+    message_id = await _post_discord_message(client, buffer or "…")
+    sent_len = len(buffer)
+    last_edit = time.monotonic()
+    for fragment in fragments:
+        full.append(fragment)
+        while fragment:
+            space = DISCORD_MESSAGE_LIMIT - len(buffer)
+            head, fragment = fragment[:space], fragment[space:]
+            buffer += head
+            if fragment:
+                # Current message is full: flush it and roll over.
+                await _edit_discord_message(client, message_id, buffer)
+                message_id = await _post_discord_message(client, "…")
+                buffer = ""
+                sent_len = 0
+                last_edit = time.monotonic()
+        now = time.monotonic()
+        if buffer and (now - last_edit >= STREAM_EDIT_INTERVAL
+                       or len(buffer) - sent_len >= STREAM_EDIT_CHARS):
+            await _edit_discord_message(client, message_id, buffer)
+            sent_len = len(buffer)
+            last_edit = now
+    if buffer and len(buffer) != sent_len:
+        await _edit_discord_message(client, message_id, buffer)
+    print("✅ Briefing streamed to Discord!")
+    return "".join(full)
+
+
+async def send_discord_message(client, briefing_text):
+    print(f"📲 Sending briefing to Discord...")
+    try:
+        for chunk in _chunk_message(briefing_text):
+            response = await client.post(DISCORD_WEBHOOK_URL,
+                                         content=_webhook_body(chunk),
+                                         headers=_JSON_HEADERS)
+            response.raise_for_status()
+        print("✅ Message sent successfully to Discord!")
+    except httpx.HTTPError as e:
+        print(f"🛑 Failed to send Discord message: {e}")
+
+
+# --- PART E: Main Orchestrator Job ---
+# Why: after the briefing is delivered, nothing the user waits on is
+# left, so the tail of the run is spent refreshing the source's cache
+# (if it has one). The next run then starts warm.
+FEED_WARM_BUDGET = 30  # seconds
+
+
+async def run_agent_job(source):
+    """Run one fetch → summarize → send cycle against a source module.
+
+    `source` must expose `async fetch(client) -> (general, ai)` and may
+    expose `warm_cache()` for the post-send prefetch.
+    """
+    print("\n--- Running News Agent Job ---")
+    today_date_str = time.strftime("%A, %B %d, %Y")
+    greeting = f"## 🇮🇳 Your Analytical Briefing: {today_date_str}\n"
+
+    async with _make_http_client() as client:
+        general_headlines, ai_headlines = await source.fetch(client)
+
+        if not general_headlines and not ai_headlines:
+            print("No news found from any source. Skipping.")
+            return
+
+        await create_briefing_from_headlines(client, greeting,
+                                             general_headlines, ai_headlines)
+
+    # Prefetch the source's cache in the background; the daemon thread
+    # is joined with a budget so a stalled fetch can't hold the job
+    # open past FEED_WARM_BUDGET seconds.
+    warm = getattr(source, "warm_cache", None)
+    if warm is not None:
+        warmer = threading.Thread(target=warm, daemon=True)
+        warmer.start()
+        warmer.join(timeout=FEED_WARM_BUDGET)
+    print("--- Agent Job Finished ---\n")
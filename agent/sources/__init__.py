@@ -0,0 +1,3 @@
+# News source modules. Each source exposes
+# `async fetch(client) -> (general_headlines, ai_headlines)` and may
+# expose `warm_cache()` for the post-send prefetch.